@@ -22,6 +22,7 @@ from mo_dots import is_data, set_default, split_field
 from mo_future import is_text, first
 from mo_json import STRUCT, value2json
 from mo_logs import Log
+from mo_math import MAX
 from mo_threads import Till
 from mo_times import Timer
 from mo_times.dates import Date
@@ -167,3 +168,27 @@ def find_container(frum, after):
         return ListContainer("test_list", frum)
     else:
         return frum
+
+
+def data_generation(frum):
+    """
+    :param frum: NAME OF THE TABLE BEING QUERIED
+    :return: A VALUE THAT CHANGES WHEN THE INDEXES OR COLUMNS BEHIND frum CHANGE,
+             OR None IF frum IS NOT A CACHEABLE TABLE
+    """
+    if not namespace or not is_text(frum):
+        return None
+
+    alias = split_field(frum)[0]
+    if alias == "meta":
+        return None
+
+    indices = tuple(sorted(
+        a.index
+        for a in namespace.es_cluster.get_aliases()
+        if a.alias == alias or a.index == alias
+    ))
+    if not indices:
+        return None
+    last_updated = MAX(c.last_updated for c in namespace.meta.columns.find(alias))
+    return indices, last_updated
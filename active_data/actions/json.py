@@ -20,12 +20,13 @@ from mo_logs import Except, Log
 from mo_math import is_integer, is_number
 from mo_threads.threads import register_thread
 from mo_times.timer import Timer
-from pyLibrary.env.flask_wrappers import cors_wrapper
+from pyLibrary.env.flask_wrappers import cors_wrapper, gzip_wrapper
 
 _keep_import = value2json
 
 
 @cors_wrapper
+@gzip_wrapper
 @register_thread
 def get_raw_json(path):
     active_data_timer = Timer("total duration")
@@ -8,28 +8,40 @@
 #
 from __future__ import absolute_import, division, unicode_literals
 
+from time import time
+
 import flask
 from flask import Response
 
 import mo_math
 from active_data import record_request
-from active_data.actions import QUERY_TOO_LARGE, find_container, save_query, send_error, test_mode_wait
+from active_data.actions import QUERY_TOO_LARGE, data_generation, find_container, save_query, send_error, test_mode_wait
 from jx_base.container import Container
+from jx_base.language import is_op
+from jx_base.query import QueryOp
+from jx_elasticsearch.es52.set_bulk import StreamedResult
 from jx_python import jx
+from mo_collections.lru_cache import LruCache
+from mo_dots import Data, coalesce
 from mo_files import File
-from mo_future import binary_type
 from mo_json import json2value, value2json
 from mo_logs import Except, Log
 from mo_threads.threads import register_thread
+from mo_times import MINUTE
 from mo_times.timer import Timer
-from pyLibrary.env.flask_wrappers import cors_wrapper
+from pyLibrary.env.flask_wrappers import cors_wrapper, current_compressor, gzip_wrapper
 
 DEBUG = False
 BLANK = File("active_data/public/error.html").read().encode('utf8')
 QUERY_SIZE_LIMIT = 10*1024*1024
+TIMING_PLACEHOLDER = "{{TIMING}}"
+
+# RESPONSES, KEYED ON NORMALIZED QUERY AND THE DATA GENERATION OF THE TABLE
+result_cache = LruCache(max_bytes=200 * 1024 * 1024, ttl=MINUTE.seconds * 5, name="query results")
 
 
 @cors_wrapper
+@gzip_wrapper
 @register_thread
 def jx_query(path):
     try:
@@ -61,43 +73,71 @@ def jx_query(path):
 
             translate_timer = Timer("translate", verbose=DEBUG)
             with translate_timer:
-                result = jx.run(data, container=frum)
-
-                if isinstance(result, Container):  # TODO: REMOVE THIS CHECK, jx SHOULD ALWAYS RETURN Containers
-                    result = result.format(data.format)
-
-            save_timer = Timer("save", verbose=DEBUG)
-            with save_timer:
-                if data.meta.save:
-                    try:
-                        result.meta.saved_as = save_query.query_finder.save(data)
-                    except Exception as e:
-                        Log.warning("Unexpected save problem", cause=e)
-
-            result.meta.timing.find_table = mo_math.round(find_table_timer.duration.seconds, digits=4)
-            result.meta.timing.preamble = mo_math.round(preamble_timer.duration.seconds, digits=4)
-            result.meta.timing.translate = mo_math.round(translate_timer.duration.seconds, digits=4)
-            result.meta.timing.save = mo_math.round(save_timer.duration.seconds, digits=4)
-            result.meta.timing.total = "{{TOTAL_TIME}}"  # TIMING PLACEHOLDER
-
-            with Timer("jsonification", verbose=DEBUG) as json_timer:
-                response_data = value2json(result).encode('utf8')
+                query_op = QueryOp.wrap(data, frum, frum.namespace) if isinstance(frum, Container) else data
+                cache_key = _cache_key(data, query_op)
+                cached = result_cache.get(cache_key) if cache_key else None
+                if not cached:
+                    result = jx.run(query_op, container=frum)
+
+                    if isinstance(result, Container):  # TODO: REMOVE THIS CHECK, jx SHOULD ALWAYS RETURN Containers
+                        result = result.format(data.format)
+
+            if not cached and isinstance(result, StreamedResult):
+                timing = result.meta.timing
+                timing.find_table = mo_math.round(find_table_timer.duration.seconds, digits=4)
+                timing.preamble = mo_math.round(preamble_timer.duration.seconds, digits=4)
+                timing.translate = mo_math.round(translate_timer.duration.seconds, digits=4)
+                return _stream_response(result, query_timer)
+
+            if cached:
+                response_data, content_type = cached
+                timing = Data(cache="hit", jsonification=0)
+            else:
+                save_timer = Timer("save", verbose=DEBUG)
+                with save_timer:
+                    if data.meta.save:
+                        try:
+                            result.meta.saved_as = save_query.query_finder.save(data)
+                        except Exception as e:
+                            Log.warning("Unexpected save problem", cause=e)
+
+                # TIMING IS DIFFERENT FOR EVERY RESPONSE, SO IT IS KEPT OUT OF THE (CACHED) JSON
+                timing = coalesce(result.meta.timing, Data())
+                result.meta.timing = TIMING_PLACEHOLDER
+                content_type = result.meta.content_type
+
+                with Timer("jsonification", verbose=DEBUG) as json_timer:
+                    response_data = value2json(result).encode('utf8')
+
+                timing.save = mo_math.round(save_timer.duration.seconds, digits=4)
+                timing.jsonification = mo_math.round(json_timer.duration.seconds, digits=4)
+                if cache_key:
+                    timing.cache = "miss"
+                    result_cache.set(cache_key, (response_data, content_type), size=len(response_data))
+
+            timing.find_table = mo_math.round(find_table_timer.duration.seconds, digits=4)
+            timing.preamble = mo_math.round(preamble_timer.duration.seconds, digits=4)
+            timing.translate = mo_math.round(translate_timer.duration.seconds, digits=4)
 
         with Timer("post timer", verbose=DEBUG):
             # IMPORTANT: WE WANT TO TIME OF THE JSON SERIALIZATION, AND HAVE IT IN THE JSON ITSELF.
             # WE CHEAT BY DOING A (HOPEFULLY FAST) STRING REPLACEMENT AT THE VERY END
-            timing_replacement = (
-                b'"total":' + binary_type(mo_math.round(query_timer.duration.seconds, digits=4)) +
-                b', "jsonification":' + binary_type(mo_math.round(json_timer.duration.seconds, digits=4))
+            timing.total = mo_math.round(query_timer.duration.seconds, digits=4)
+            compressor = current_compressor()
+            if compressor and compressor.will_compress(len(response_data)):
+                timing.compression = compressor.timing
+            response_data = response_data.replace(
+                b'"' + TIMING_PLACEHOLDER.encode('utf8') + b'"',
+                value2json(timing).encode('utf8'),
+                1
             )
-            response_data = response_data.replace(b'"total":"{{TOTAL_TIME}}"', timing_replacement)
             Log.note("Response is {{num}} bytes in {{duration}}", num=len(response_data), duration=query_timer.duration)
 
             return Response(
                 response_data,
                 status=200,
                 headers={
-                    "Content-Type": result.meta.content_type
+                    "Content-Type": content_type
                 }
             )
     except Exception as e:
@@ -105,3 +145,65 @@ def jx_query(path):
         return send_error(query_timer, request_body, e)
 
 
+def _cache_key(data, query_op):
+    """
+    :param data: THE QUERY, AS SENT
+    :param query_op: THE NORMALIZED QUERY
+    :return: KEY FOR result_cache, OR None IF THE RESULT SHOULD NOT BE CACHED
+    """
+    if data.meta.cache is False or data.meta.save or not is_op(query_op, QueryOp) or query_op.destination:
+        return None
+    try:
+        generation = data_generation(data['from'])
+        if generation is None:
+            return None
+        return value2json({
+            "from": data['from'],
+            "select": query_op.select,
+            "edges": query_op.edges,
+            "groupby": query_op.groupby,
+            "window": query_op.window,
+            "where": query_op.where,
+            "sort": query_op.sort,
+            "limit": query_op.limit,
+            "format": data.format,
+            "generation": generation
+        })
+    except Exception as e:
+        Log.warning("Can not make cache key", cause=e)
+        return None
+
+
+def _stream_response(result, query_timer):
+    """
+    SEND THE RESULT WITH CHUNKED TRANSFER ENCODING, AS IT IS MADE
+    THE meta (WITH TIMING) IS SENT LAST
+    """
+    meta = result.meta
+    compressor = current_compressor()
+
+    def chunks():
+        stream_timer = Timer("stream", verbose=DEBUG)
+        try:
+            with stream_timer:
+                for chunk in result.chunks:
+                    yield chunk
+        except Exception as e:
+            e = Except.wrap(e)
+            Log.warning("Problem streaming response", cause=e)
+            meta.error = e
+
+        meta.timing.stream = mo_math.round(stream_timer.duration.seconds, digits=4)
+        meta.timing.total = mo_math.round(time() - query_timer.start, digits=4)
+        if compressor:
+            # TIME SPENT COMPRESSING ALL BUT THIS LAST CHUNK
+            meta.timing.compression = compressor.timing
+        yield b',"meta":' + value2json(meta).encode('utf8') + b'}'
+
+    return Response(
+        chunks(),
+        status=200,
+        headers={
+            "Content-Type": meta.content_type
+        }
+    )
@@ -15,6 +15,7 @@ from flask import Response
 import jx_elasticsearch
 from jx_elasticsearch.elasticsearch import Cluster
 from jx_python.containers.cube import Cube
+from jx_python.expressions import warm_up
 from mo_dots import wrap
 from mo_future import first
 from mo_json import json2value, value2json
@@ -27,6 +28,7 @@ from pyLibrary import convert
 from pyLibrary.env.flask_wrappers import cors_wrapper
 
 HASH_BLOCK_SIZE = 100
+WARM_UP_SIZE = 200  # NUMBER OF RECENTLY-USED QUERIES TO COMPILE AT STARTUP
 DATA_TYPE = "query"
 
 query_finder = None
@@ -102,6 +104,34 @@ class SaveQueries(object):
 
         return query
 
+    def warm_up(self, please_stop):
+        """
+        COMPILE THE EXPRESSIONS OF THE RECENTLY-USED QUERIES, SO THEY ARE
+        IN THE CACHE WHEN ASKED FOR AGAIN
+        """
+        try:
+            result = self.es.query(
+                {
+                    "select": "query",
+                    "from": "saved_queries",
+                    "sort": {"last_used": "desc"},
+                    "limit": WARM_UP_SIZE,
+                    "format": "list",
+                }
+            )
+            queries = []
+            for q in result.data:
+                if please_stop:
+                    return
+                try:
+                    queries.append(json2value(q))
+                except Exception:
+                    pass
+            num = warm_up(queries)
+            Log.note("compiled {{num}} expressions from saved queries", num=num)
+        except Exception as e:
+            Log.warning("problem warming up saved queries", cause=e)
+
     def save(self, query):
         """
         SAVE query TO ES FOR LATER RECOVERY
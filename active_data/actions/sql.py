@@ -8,6 +8,9 @@
 #
 from __future__ import absolute_import, division, unicode_literals
 
+from copy import deepcopy
+import re
+
 import flask
 from flask import Response
 
@@ -18,17 +21,19 @@ from active_data.actions import find_container, save_query, send_error, test_mod
 from active_data.actions.query import BLANK, QUERY_SIZE_LIMIT
 from jx_base.container import Container
 from jx_python import jx
-from mo_dots import is_data, is_list, listwrap, unwraplist, wrap
+from mo_collections.lru_cache import LruCache
+from mo_dots import is_data, is_list, listwrap, unwrap, unwraplist, wrap
 from mo_json import json2value, value2json
 from mo_logs import Log
 from mo_logs.exceptions import Except
 from mo_testing.fuzzytestcase import assertAlmostEqual
 from mo_threads.threads import register_thread
 from mo_times.timer import Timer
-from pyLibrary.env.flask_wrappers import cors_wrapper
+from pyLibrary.env.flask_wrappers import cors_wrapper, current_compressor, gzip_wrapper
 
 
 @cors_wrapper
+@gzip_wrapper
 @register_thread
 def sql_query(path):
     query_timer = Timer("total duration")
@@ -89,8 +94,11 @@ def sql_query(path):
         with Timer("post timer", silent=True):
             # IMPORTANT: WE WANT TO TIME OF THE JSON SERIALIZATION, AND HAVE IT IN THE JSON ITSELF.
             # WE CHEAT BY DOING A (HOPEFULLY FAST) STRING REPLACEMENT AT THE VERY END
-            timing_replacement = b'"total": ' + str(mo_math.round(query_timer.duration.seconds, digits=4)) +\
-                                 b', "jsonification": ' + str(mo_math.round(json_timer.duration.seconds, digits=4))
+            timing_replacement = b'"total": ' + str(mo_math.round(query_timer.duration.seconds, digits=4)).encode('utf8') +\
+                                 b', "jsonification": ' + str(mo_math.round(json_timer.duration.seconds, digits=4)).encode('utf8')
+            compressor = current_compressor()
+            if compressor and compressor.will_compress(len(response_data)):
+                timing_replacement += b', "compression": ' + value2json(compressor.timing).encode('utf8')
             response_data = response_data.replace(b'"total":"{{TOTAL_TIME}}"', timing_replacement)
             Log.note("Response is {{num}} bytes in {{duration}}", num=len(response_data), duration=query_timer.duration)
 
@@ -107,9 +115,47 @@ def sql_query(path):
 
 
 KNOWN_SQL_AGGREGATES = {"sum", "count", "avg", "median", "percentile", "max", "min"}
+MAX_PARSED = 1000  # NUMBER OF PARSED SQL STATEMENTS TO KEEP
+
+# MAP FROM NORMALIZED SQL TO ITS (UNWRAPPED) JX QUERY
+# parsed.stats HAS THE hits AND misses
+parsed = LruCache(max_size=MAX_PARSED, name="parsed sql")
+
+# QUOTED STRINGS (SAME AS THE PARSER SEES THEM), -- AND # COMMENTS, OR RUNS OF WHITESPACE
+_sql_tokens = re.compile(r"'(''|\\.|[^'])*'|\"(\"\"|\\.|[^\"])*\"|`(``|\\.|[^`])*`|--[^\n]*|#[^\n]*|\s+")
+
+
+def normalize_sql(sql):
+    """
+    :return: sql WITH EACH RUN OF WHITESPACE (OUTSIDE OF QUOTES AND COMMENTS) AS ONE CHARACTER
+    """
+    def collapse(match):
+        token = match.group(0)
+        if not token[0].isspace():
+            return token
+        elif "\n" in token:
+            # KEEP LINE BREAKS, THEY END -- COMMENTS
+            return "\n"
+        return " "
+
+    return _sql_tokens.sub(collapse, sql).strip().rstrip(";").rstrip()
 
 
 def parse_sql(sql):
+    """
+    :param sql: SQL TEXT
+    :return: JX QUERY; A NEW COPY FOR EACH CALL, SO IT CAN BE CHANGED
+    """
+    key = normalize_sql(sql)
+    query = parsed.get(key)
+    if query is None:
+        # THE key IS ONLY FOR LOOKUP, PARSE WHAT WAS SENT
+        query = unwrap(_parse_sql(sql))
+        parsed.set(key, query)
+    return wrap(deepcopy(query))
+
+
+def _parse_sql(sql):
     # TODO: CONVERT tuple OF LITERALS INTO LITERAL LIST
     # # IF ALL MEMBERS OF A LIST ARE LITERALS, THEN MAKE THE LIST LITERAL
     # if all(isinstance(r, number_types) for r in output):
@@ -17,7 +17,7 @@ from flask import Flask, Response
 
 import active_data
 from active_data import OVERVIEW, record_request
-from active_data.actions import save_query
+from active_data.actions import query, save_query
 from active_data.actions.contribute import send_contribute
 from active_data.actions.json import get_raw_json
 from active_data.actions.query import jx_query
@@ -27,6 +27,7 @@ from active_data.actions.static import download, send_favicon
 from jx_base import container
 from jx_elasticsearch.es52 import agg_bulk, QueryStats
 from jx_elasticsearch import elasticsearch
+from mo_collections.lru_cache import LruCache
 from mo_dots import is_data
 from mo_files import File, TempFile
 from mo_future import text
@@ -119,6 +120,13 @@ def setup():
 
     agg_bulk.S3_CONFIG = config.bulk.s3
 
+    if config.query_cache:
+        query.result_cache = LruCache(
+            max_bytes=config.query_cache.max_bytes,
+            ttl=config.query_cache.ttl,
+            name="query results"
+        )
+
     File.new_instance("activedata.pid").write(text(machine_metadata.pid))
 
     # PIPE REQUEST LOGS TO ES DEBUG
@@ -144,6 +152,7 @@ def setup():
     # TRIGGER FIRST INSTANCE
     if config.saved_queries:
         setattr(save_query, "query_finder", SaveQueries(config.saved_queries))
+        Thread.run("warm up saved queries", save_query.query_finder.warm_up)
 
     # STARTUP QUERY STATS
     QueryStats(elasticsearch.Cluster(config.elasticsearch))
@@ -0,0 +1,110 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+from jx_elasticsearch.es52.agg_bulk import Throttle, Window, partition_worker
+from mo_dots import Data, Null, wrap
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from mo_threads import Queue, Signal, Thread, Till
+
+NUM_PARTITIONS = 6
+
+
+class TestAggBulk(FuzzyTestCase):
+    def test_partitions_in_order(self):
+        es = FakeES()
+        todo = Queue("todo", silent=True)
+        todo.extend(range(NUM_PARTITIONS))
+        todo.close()
+        done = Queue("done", silent=True)
+        es_queries = [_query(), _query()]
+        partitions = ["waiting"] * NUM_PARTITIONS
+
+        partition_worker(
+            todo,
+            done,
+            Throttle(1),
+            Window(NUM_PARTITIONS),
+            es_queries,
+            NUM_PARTITIONS,
+            Data(es=es),
+            None,
+            partitions,
+            Signal(),
+            please_stop=Signal(),
+        )
+
+        self.assertEqual(es.requested, list(range(NUM_PARTITIONS)))
+        self.assertEqual([i for i, _ in done.pop_all()], list(range(NUM_PARTITIONS)))
+        self.assertEqual(partitions, ["done"] * NUM_PARTITIONS)
+
+    def test_stops_when_asked(self):
+        todo = Queue("todo", silent=True)  # NEVER CLOSED
+        please_stop = Signal()
+        please_stop.go()
+        partition_worker(todo, Queue("done", silent=True), Throttle(1), Window(1), [], 1, Data(es=FakeES()), None, [], Signal(), please_stop=please_stop)
+
+    def test_window_limits_pending(self):
+        es = FakeES()
+        todo = Queue("todo", silent=True)
+        todo.extend(range(NUM_PARTITIONS))
+        todo.close()
+        done = Queue("done", silent=True)
+        window = Window(2)
+        stop_workers = Signal()
+        worker = Thread.run(
+            "worker",
+            partition_worker,
+            todo,
+            done,
+            Throttle(1),
+            window,
+            [_query(), _query()],
+            NUM_PARTITIONS,
+            Data(es=es),
+            None,
+            ["waiting"] * NUM_PARTITIONS,
+            stop_workers,
+            parent_thread=Null,
+        )
+        try:
+            # NOTHING WRITTEN, SO ONLY PARTITIONS 0 AND 1 ARE REQUESTED
+            Till(seconds=0.5).wait()
+            self.assertTrue(es.requested == [0, 1])
+
+            window.advance(1)
+            for _ in range(50):
+                if len(es.requested) == 3:
+                    break
+                Till(seconds=0.1).wait()
+            Till(seconds=0.2).wait()
+            self.assertTrue(es.requested == [0, 1, 2])
+
+            window.advance(NUM_PARTITIONS)
+            worker.join()
+            self.assertTrue(es.requested == list(range(NUM_PARTITIONS)))
+        finally:
+            stop_workers.go()
+            worker.join()
+
+
+class FakeES(object):
+    def __init__(self):
+        self.requested = []
+
+    def search(self, query, timeout):
+        partition = query.aggs._filter.aggs._match.terms.include.partition
+        self.requested.append(partition)
+        return wrap({"aggregations": {"partition": partition}})
+
+
+def _query():
+    return wrap({"aggs": {"_filter": {"aggs": {"_match": {"terms": {"field": "a", "include": {}}}}}}})
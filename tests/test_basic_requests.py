@@ -126,6 +126,33 @@ class TestBasicRequests(BaseTestCase):
         except Exception:
             pass
 
+    def test_query_result_cache(self):
+        data = [
+            {"a": 0, "b": 0},
+            {"a": 0, "b": 1},
+            {"a": 1, "b": 0},
+            {"a": 1, "b": 1}
+        ]
+
+        test = wrap({
+            "data": data,
+            "query": {"from": TEST_TABLE, "select": ["a", "b"], "format": "list"},
+            "expecting_list": {"data": data}
+        })
+        self.utils.execute_tests(test)  # LOAD, AND SET meta.testing=True
+
+        query = {"from": test.query['from'], "select": ["a", "b"], "where": {"eq": {"a": 1}}, "format": "list"}
+        first = http.post_json(url=self.utils.testing.query, json=query)
+        second = http.post_json(url=self.utils.testing.query, json=query)
+        self.assertEqual(first.meta.timing.cache, "miss")
+        self.assertEqual(second.meta.timing.cache, "hit")
+        self.assertEqual(first.data, second.data)
+
+        query["meta"] = {"cache": False}
+        bypass = http.post_json(url=self.utils.testing.query, json=query)
+        self.assertEqual(bypass.meta.timing.cache, None)
+        self.assertEqual(first.data, bypass.data)
+
     def test_query_on_es_fields(self):
         schema = {
             "settings": {"analysis": {
@@ -0,0 +1,121 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+from jx_base import Column
+from jx_elasticsearch.column_index import ColumnIndex
+from jx_elasticsearch.meta_columns import ColumnList
+from mo_dots import Data, relative_field, startswith_field, wrap
+from mo_json import NESTED, NUMBER, OBJECT, STRING
+from mo_json.typed_encoder import unnest_path, untype_path
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from mo_times import Date, HOUR
+
+COLUMNS = [
+    Data(name=name, es_column=name, jx_type=jx_type)
+    for name, jx_type in [
+        ("a", OBJECT),
+        ("a.b.~s~", STRING),
+        ("a.b.~n~", NUMBER),
+        ("a.b-c.~s~", STRING),
+        ("a.bc.~s~", STRING),
+        ("a.d.~N~", NESTED),
+        ("a.d.~N~.e.~s~", STRING),
+        ("a.d.~N~.f.g.~n~", NUMBER),
+        ("ab.~s~", STRING),
+        ("x\\.y.~s~", STRING),
+        ("z.~n~", NUMBER),
+    ]
+]
+PATHS = [".", "a.d.~N~", "a"]
+PREFIXES = [".", "a", "a.b", "a.d", "a.d.~N~", "d", "d.e", "f", "..", "..a", "ab", "x\\.y", "q"]
+
+
+class TestColumnIndex(FuzzyTestCase):
+    def test_startswith(self):
+        index = ColumnIndex(COLUMNS)
+        for path in PATHS:
+            for unnest in [True, False]:
+                cleaner = unnest_path if unnest else (lambda x: x)
+                for prefix in PREFIXES:
+                    expected = [
+                        c.name
+                        for c in COLUMNS
+                        if startswith_field(cleaner(relative_field(c.name, path)), prefix)
+                    ]
+                    result = [c.name for c in index.in_order(index.startswith(path, prefix, unnest))]
+                    self.assertEqual(result, expected, "for " + path + " " + prefix + " " + str(unnest))
+
+    def test_untyped(self):
+        index = ColumnIndex(COLUMNS)
+        for name in ["a.b", "a.d.e", "x\\.y", "a", "q"]:
+            expected = [c.name for c in COLUMNS if untype_path(c.name) == name]
+            self.assertEqual([c.name for c in index.untyped(name)], expected)
+
+    def test_map_to_es_is_a_copy(self):
+        index = ColumnIndex(COLUMNS)
+        first = index.map_to_es(["a.d.~N~", "."])
+        self.assertEqual(first["e"], "a.d.~N~.e.~s~")
+        self.assertEqual(first["a.b"], "a.b.~n~")
+        first["e"] = "changed"
+        self.assertEqual(index.map_to_es(["a.d.~N~", "."])["e"], "a.d.~N~.e.~s~")
+
+    def test_version_only_changes_with_names(self):
+        columns = ColumnList(FakeCluster())
+        columns.updater.stop()
+        columns.updater.join()
+        columns.add(_column("a"))
+        version = columns.version
+
+        # WHAT THE SCANNERS DO
+        columns.update({
+            "set": {"count": 10, "cardinality": 2, "partitions": ["x", "y"], "last_updated": Date.now()},
+            "where": {"eq": {"es_index": "testing", "es_column": "a"}},
+        })
+        newer = _column("a")
+        newer.cardinality = 3
+        newer.last_updated = Date.now() + HOUR
+        columns.add(newer)
+        self.assertEqual(columns.version, version)
+
+        columns.add(_column("b"))
+        self.assertNotEqual(columns.version, version)
+        version = columns.version
+
+        columns.update({"set": {"es_column": "a2"}, "where": {"eq": {"es_index": "testing", "es_column": "a"}}})
+        self.assertNotEqual(columns.version, version)
+        version = columns.version
+
+        columns.update({"clear": ".", "where": {"eq": {"es_index": "testing", "es_column": "b"}}})
+        self.assertNotEqual(columns.version, version)
+
+
+class FakeCluster(object):
+    def get_index(self, id, index, type, read_only):
+        return self
+
+    def search(self, query):
+        return wrap({"hits": {"total": 0, "hits": []}})
+
+    def extend(self, records):
+        pass
+
+
+def _column(name):
+    return Column(
+        name=name,
+        es_column=name,
+        es_index="testing",
+        es_type="keyword",
+        jx_type=STRING,
+        nested_path=(".",),
+        last_updated=Date.now() - HOUR,
+    )
@@ -0,0 +1,173 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+from jx_base import Column
+from jx_elasticsearch.meta import ElasticsearchMetadata, SCAN_BATCH_SIZE, TOO_OLD
+from jx_elasticsearch.meta_columns import ColumnList
+from mo_dots import Data, wrap
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from mo_threads import Lock, Queue
+from mo_times import Date, HOUR
+
+
+class TestColumnScan(FuzzyTestCase):
+    """
+    CARDINALITY SCAN AGAINST CANNED ES RESPONSES, NO ELASTICSEARCH NEEDED
+    """
+
+    def setUp(self):
+        self.es = FakeCluster()
+        columns = ColumnList(self.es)
+        columns.updater.stop()
+        columns.updater.join()
+
+        # SKIP __init__(), IT CONNECTS TO THE CLUSTER AND STARTS THE SCANNERS
+        self.meta = object.__new__(ElasticsearchMetadata)
+        self.meta.es_cluster = self.es
+        self.meta.index_does_not_exist = set()
+        self.meta.meta = Data(columns=columns)
+        self.meta.todo = Queue("refresh metadata", unique=True, silent=True)
+        self.meta.scan_locker = Lock()
+        self.meta.scan_pending = {}
+        self.meta.usage = {}
+
+    def test_update_cardinalities(self):
+        name = _column("name", "keyword")
+        size = _column("size", "long")
+        self.meta.meta.columns.extend([name, size])
+        self.es.responses = [
+            {
+                "hits": {"total": 50},
+                "aggregations": {
+                    "c0": {"value": 3},
+                    "m0": {"doc_count": 50, "multi": {"value": 1}},
+                    "c1": {"value": 40},
+                    "m1": {"doc_count": 50, "multi": {"value": 2}},
+                },
+            },
+            {
+                "aggregations": {
+                    "_0": {"buckets": [{"key": "z", "doc_count": 10}, {"key": "x", "doc_count": 20}, {"key": "y", "doc_count": 20}]}
+                }
+            },
+        ]
+
+        self.meta._update_cardinalities([name, size])
+
+        # ONE REQUEST FOR ALL COUNTS, ONE FOR THE PARTITIONS THAT ARE WORTH KNOWING
+        self.assertEqual(len(self.es.requests), 2)
+        self.assertTrue(all(path == "/testing/_search" for path, _ in self.es.requests))
+        counts, parts = [q for _, q in self.es.requests]
+        self.assertEqual(set(counts.aggs.keys()), {"c0", "m0", "c1", "m1"})
+        self.assertEqual(counts.aggs.c0.cardinality.field, "name")
+        self.assertEqual(counts.aggs.c1.cardinality.field, "size")
+        self.assertEqual(set(parts.aggs.keys()), {"_0"})
+        self.assertEqual(parts.aggs._0.terms, {"field": "name", "size": 3})
+
+        self.assertTrue(name.count == 50)
+        self.assertTrue(name.cardinality == 3)
+        self.assertTrue(name.multi == 1)
+        self.assertTrue(name.partitions == ["x", "y", "z"])
+
+        # NUMERIC, WITH TOO MANY VALUES FOR PARTITIONS
+        self.assertTrue(size.count == 50)
+        self.assertTrue(size.cardinality == 40)
+        self.assertTrue(size.multi == 2)
+        self.assertTrue(size.partitions == None)
+
+    def test_fresh_column_not_scanned(self):
+        fresh = _column("fresh", "keyword", cardinality=3, last_updated=Date.now())
+        self.assertFalse(self.meta._needs_scan((fresh, None)))
+        self.assertFalse(self.meta._needs_scan((fresh, Date.now() - HOUR)))
+
+    def test_stale_column_scanned(self):
+        never = _column("never", "keyword")
+        self.assertTrue(self.meta._needs_scan((never, None)))
+
+        requested = _column("requested", "keyword", cardinality=3, last_updated=Date.now() - HOUR)
+        self.assertTrue(self.meta._needs_scan((requested, Date.now())))
+
+        old = _column("old", "keyword", cardinality=3, last_updated=Date.now() - TOO_OLD - HOUR)
+        self.assertTrue(self.meta._needs_scan((old, None)))
+
+    def test_missing_index_not_scanned(self):
+        gone = _column("gone", "keyword", es_index="deleted")
+        self.meta.meta.columns.add(gone)
+        self.assertFalse(self.meta._needs_scan((gone, None)))
+        self.assertEqual(self.meta.meta.columns.find("deleted"), [])
+
+    def test_scan_grouped_by_index(self):
+        many = [_column("m" + str(i), "keyword") for i in range(SCAN_BATCH_SIZE + 10)]
+        other = [_column("o" + str(i), "keyword", es_index="other") for i in range(3)]
+        self.meta.usage = {("testing", "m7"): 5, ("testing", "m55"): 9}
+        self.meta._scan_later((c, None) for c in many)
+        self.meta._scan_later((c, None) for c in other)
+        self.meta._scan_later([(many[0], None)])  # ALREADY PENDING
+        self.assertTrue(self.meta.todo.pop_all() == ["testing", "other"])
+
+        self.meta.todo.extend(["testing", "other"])
+        batch = self.meta._take_scan(self.meta.todo.pop(), SCAN_BATCH_SIZE)
+        self.assertEqual(len(batch), SCAN_BATCH_SIZE)
+        self.assertTrue([c.name for c, _ in batch[:2]] == ["m55", "m7"])
+
+        # THE REST OF testing WAITS BEHIND other
+        self.assertTrue(self.meta.todo.pop_all() == ["other", "testing"])
+        rest = self.meta._take_scan("testing", SCAN_BATCH_SIZE)
+        self.assertEqual(len(rest), 10)
+        self.assertTrue(set(id(c) for c, _ in batch + rest) == set(id(c) for c in many))
+        self.assertEqual(len(self.meta.todo), 0)
+        self.assertTrue(self.meta._take_scan("testing", SCAN_BATCH_SIZE) == [])
+
+    def test_rescan_first(self):
+        self.meta._scan_later([(_column("a", "keyword", es_index="old"), None)])
+        self.meta._scan_later([(_column("b", "keyword"), None)], first=True)
+        self.assertTrue(self.meta.todo.pop_all() == ["testing", "old"])
+
+
+class FakeCluster(object):
+    """
+    ANSWER post() WITH THE GIVEN responses, IN ORDER
+    """
+
+    def __init__(self):
+        self.responses = []
+        self.requests = []
+
+    def get_index(self, id, index, type, read_only):
+        return self
+
+    def search(self, query):
+        return wrap({"hits": {"total": 0, "hits": []}})
+
+    def extend(self, records):
+        pass
+
+    def get_aliases(self, after=None):
+        return [Data(index="testing_20200101", alias="testing")]
+
+    def post(self, path, data):
+        self.requests.append((path, wrap(data)))
+        return wrap(self.responses.pop(0))
+
+
+def _column(name, es_type, es_index="testing", cardinality=None, last_updated=None):
+    return Column(
+        name=name,
+        es_column=name,
+        es_index=es_index,
+        es_type=es_type,
+        jx_type="number" if es_type == "long" else "string",
+        nested_path=(".",),
+        cardinality=cardinality,
+        multi=1,
+        last_updated=last_updated or Date.now() - TOO_OLD - HOUR,
+    )
@@ -0,0 +1,170 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import os
+
+from jx_base import Column
+from jx_elasticsearch.meta_columns import ColumnList
+from mo_dots import wrap
+from mo_files import TempDirectory
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from mo_times import Date, HOUR
+
+
+class TestColumnSnapshot(FuzzyTestCase):
+    """
+    TWO ColumnList SHARING ONE SNAPSHOT, AS TWO PROCESSES WOULD
+    NO ELASTICSEARCH NEEDED
+    """
+
+    def setUp(self):
+        self.temp = TempDirectory()
+        self.snapshot = self.temp.abspath + "/columns.json"
+        self.es = FakeCluster([_column("t", "a"), _column("t", "b"), _column("u", "c")])
+        self.columns = []
+
+    def tearDown(self):
+        for c in self.columns:
+            if c.snapshot_lock:
+                c.snapshot_lock.close()
+        self.temp.delete()
+
+    def column_list(self):
+        output = ColumnList(self.es, snapshot=self.snapshot)
+        # STOP THE BACKGROUND UPDATE, THE TEST WILL CALL ITS STEPS
+        output.updater.stop()
+        output.updater.join()
+        self.columns.append(output)
+        return output
+
+    def test_round_trip(self):
+        owner = self.column_list()
+        self.assertTrue(owner.owner)
+        owner.add(_column("u", "d"))
+        owner._snapshot_write()
+
+        reader = self.column_list()
+        self.assertFalse(reader.owner)
+        self.assertEqual(_names(reader), _names(owner))
+        self.assertEqual(_names(reader), {"t.a", "t.b", "u.c", "u.d"})
+        self.assertEqual(reader.last_load, owner.last_load)
+
+    def test_catch_up_from_es(self):
+        owner = self.column_list()
+        owner._snapshot_write()
+        self.es.index.docs.append(_column("u", "d", last_updated=Date.now() + HOUR).__dict__())
+
+        reader = self.column_list()
+        self.assertEqual(_names(reader), {"t.a", "t.b", "u.c", "u.d"})
+
+    def test_reload_with_deleted_column(self):
+        owner = self.column_list()
+        owner._snapshot_write()
+        reader = self.column_list()
+        self.assertEqual(_names(reader), {"t.a", "t.b", "u.c"})
+
+        owner.update({"clear": ".", "where": {"eq": {"es_index": "t", "es_column": "b"}}})
+        owner.add(_column("u", "d"))
+        owner._snapshot_write()
+        _touch(self.snapshot)
+
+        version = reader.version
+        reader._snapshot_reload()
+        self.assertEqual(_names(reader), {"t.a", "u.c", "u.d"})
+        self.assertEqual(reader.find("t", "b"), [])
+        self.assertNotEqual(reader.version, version)
+
+        # WHOLE TABLE DELETED
+        owner.update({"clear": ".", "where": {"eq": {"es_index": "t", "es_column": "a"}}})
+        owner._snapshot_write()
+        _touch(self.snapshot)
+        reader._snapshot_reload()
+        self.assertEqual(_names(reader), {"u.c", "u.d"})
+        self.assertTrue("t" not in reader.data)
+
+    def test_reload_keeps_newer_column(self):
+        owner = self.column_list()
+        owner._snapshot_write()
+        reader = self.column_list()
+
+        # FOUND BY THE reader, NOT YET SEEN BY THE owner
+        reader.add(_column("u", "d", last_updated=Date.now() + HOUR))
+        owner._snapshot_write()
+        _touch(self.snapshot)
+        reader._snapshot_reload()
+        self.assertEqual(_names(reader), {"t.a", "t.b", "u.c", "u.d"})
+
+    def test_ownership_handoff(self):
+        first = self.column_list()
+        first._snapshot_write()
+        second = self.column_list()
+        self.assertTrue(first.owner)
+        self.assertFalse(second.owner)
+
+        second._claim_ownership()
+        self.assertFalse(second.owner, "expecting the lock to still be held")
+
+        # first PROCESS ENDS, RELEASING THE LOCK
+        first.snapshot_lock.close()
+        first.snapshot_lock = None
+
+        second._claim_ownership()
+        self.assertTrue(second.owner)
+        first._claim_ownership()
+        self.assertFalse(first.owner)
+
+
+class FakeCluster(object):
+    def __init__(self, columns):
+        self.index = FakeIndex([c.__dict__() for c in columns])
+
+    def get_index(self, id, index, type, read_only):
+        return self.index
+
+
+class FakeIndex(object):
+    def __init__(self, docs):
+        self.docs = docs
+
+    def search(self, query):
+        query = wrap(query)
+        gte = query.query.range["last_updated.~n~"].gte
+        docs = [d for d in self.docs if gte == None or Date(d["last_updated"]) >= Date(gte)]
+        return wrap({"hits": {"total": len(docs), "hits": [{"_source": d} for d in docs]}})
+
+    def extend(self, records):
+        self.docs.extend(r["value"] for r in records)
+
+
+def _column(es_index, name, last_updated=None):
+    return Column(
+        name=name,
+        es_column=name,
+        es_index=es_index,
+        es_type="keyword",
+        jx_type="string",
+        nested_path=(".",),
+        count=10,
+        cardinality=2,
+        multi=1,
+        last_updated=last_updated or Date.now() - HOUR,
+    )
+
+
+def _names(columns):
+    return set(c.es_index + "." + c.name for c in columns._all_columns())
+
+
+def _touch(filename):
+    # FILESYSTEM TIMESTAMPS ARE COARSE, ENSURE THE CHANGE IS SEEN
+    mtime = os.path.getmtime(filename) + 1
+    os.utime(filename, (mtime, mtime))
@@ -0,0 +1,64 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+from mo_collections.matrix import DenseMatrix, Matrix
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+
+class TestDenseMatrix(FuzzyTestCase):
+    def test_same_as_matrix(self):
+        dense = Matrix.dense((2, 3))
+        plain = Matrix(dims=(2, 3))
+        self.assertIsInstance(dense, DenseMatrix)
+        for m in (dense, plain):
+            m[0, 1] = 5
+            m[1, 2] = 2
+            m[(1, 0)] = 7
+
+        self.assertEqual(dense.cube, [[None, 5, None], [7, None, 2]])
+        self.assertEqual(list(dense.items()), list(plain.items()))
+        self.assertEqual(dense.aggregate("max"), 7)
+        self.assertEqual(dense.aggregate("min"), 2)
+        self.assertEqual(dense[(1, None)].cube, [7, None, 2])
+        self.assertEqual(dense[(None, 1)].cube, [5, None])
+
+    def test_integers_stay_integers(self):
+        m = Matrix.dense((2,), zeros=0)
+        m[0] = m[0] + 3
+        self.assertIsInstance(m[0], int)
+        self.assertIsInstance(m[1], int)
+        m[1] = 0.5
+        self.assertEqual(m.cube, [3, 0.5])
+
+    def test_not_a_number(self):
+        m = Matrix.dense((2,))
+        m[0] = 1
+        m[1] = "a"
+        self.assertEqual(m.cube, [1, "a"])
+        self.assertFalse(m.is_typed)
+
+    def test_arithmetic(self):
+        m = Matrix.dense((2, 2))
+        m[0, 0] = 4
+        m[1, 1] = 2
+        self.assertEqual((m + 1).cube, [[5, None], [None, 3]])
+        self.assertEqual((10 - m).cube, [[6, None], [None, 8]])
+        self.assertEqual((m / 2).cube, [[2, None], [None, 1]])
+        self.assertEqual((m / 0).cube, [[None, None], [None, None]])
+        self.assertEqual((m * m).cube, [[16, None], [None, 4]])
+
+    def test_groupby(self):
+        m = Matrix.dense((2, 3))
+        m[1, 2] = 9
+        groups = m.groupby([1, 0])
+        self.assertEqual([g for g, _ in groups], [(0, -1), (1, -1)])
+        self.assertEqual(groups[1][1].cube, [None, None, 9])
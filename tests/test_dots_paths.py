@@ -0,0 +1,152 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+from mo_dots import concat_field, join_field, relative_field, split_field, unwrap, wrap
+from mo_logs import Log
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from mo_times import Timer
+
+REPEAT = 20
+
+# COLUMN NAMES, AND NESTED PATHS, LIKE THOSE SEEN DURING QUERY TRANSLATION
+NAMES = [
+    "build.branch.~s~",
+    "run.timestamp.~n~",
+    "run.suite.name.~s~",
+    "result.subtests.~N~.value.~n~",
+    "result.subtests.~N~.name.~s~",
+    "repo.changeset.id\\.short.~s~",
+    "task.tags.~N~.name.~s~",
+    "..parent.name.~s~",
+    "a",
+    ".",
+]
+PATHS = [".", "result.subtests.~N~", "task.tags.~N~", "run"]
+
+
+class TestDotsPaths(FuzzyTestCase):
+    def test_same_as_uncached(self):
+        for name in NAMES:
+            self.assertEqual(split_field(name), _split_field(name))
+            for path in PATHS:
+                if not name.startswith(".."):
+                    self.assertEqual(join_field(split_field(name)), _join_field(_split_field(name)))
+                    self.assertEqual(relative_field(name, path), _relative_field(name, path))
+                self.assertEqual(concat_field(path, name), _concat_field(path, name))
+                # AGAIN, FROM THE CACHE
+                self.assertEqual(concat_field(path, name), _concat_field(path, name))
+
+    def test_join_escapes(self):
+        self.assertEqual(join_field(["a", "b.c", None, "d"]), "a.b\\.c.d")
+        self.assertEqual(join_field(x for x in ["a", "b"]), "a.b")
+        self.assertEqual(join_field([]), ".")
+        self.assertEqual(join_field([None]), ".")
+
+    def test_split_is_a_copy(self):
+        path = split_field("a.b.c")
+        path.append("d")
+        self.assertEqual(split_field("a.b.c"), ["a", "b", "c"])
+
+    def test_data_paths(self):
+        d = wrap({"a": {"b.c": {"d": 1}}})
+        d["a.b\\.c.e"] = 2
+        self.assertTrue(unwrap(d) == {"a": {"b.c": {"d": 1, "e": 2}}})
+        self.assertEqual(d["a.b\\.c.d"], 1)
+        del d["a.b\\.c.d"]
+        self.assertTrue(unwrap(d) == {"a": {"b.c": {"e": 2}}})
+        self.assertTrue(d["x.y"]["z.w"] == None)
+
+    def test_speed_concat(self):
+        pairs = [(p, n) for p in PATHS for n in NAMES if not n.startswith("..")] * 100
+        with Timer("uncached concat_field") as uncached:
+            for _ in range(REPEAT):
+                for p, n in pairs:
+                    _concat_field(p, n)
+        with Timer("concat_field") as cached:
+            for _ in range(REPEAT):
+                for p, n in pairs:
+                    concat_field(p, n)
+        Log.note("concat_field: {{old}} before, {{new}} after", old=uncached.duration, new=cached.duration)
+        self.assertLess(cached.duration.seconds, uncached.duration.seconds)
+
+    def test_speed_relative(self):
+        pairs = [(n, p) for p in PATHS for n in NAMES if not n.startswith("..")] * 100
+        with Timer("uncached relative_field") as uncached:
+            for _ in range(REPEAT):
+                for n, p in pairs:
+                    _relative_field(n, p)
+        with Timer("relative_field") as cached:
+            for _ in range(REPEAT):
+                for n, p in pairs:
+                    relative_field(n, p)
+        Log.note("relative_field: {{old}} before, {{new}} after", old=uncached.duration, new=cached.duration)
+        self.assertLess(cached.duration.seconds, uncached.duration.seconds)
+
+    def test_speed_data_paths(self):
+        rows = [wrap({"run": {"suite": {"name": "s" + str(i)}, "timestamp": i}, "build": {"branch": "b"}}) for i in range(1000)]
+        with Timer("Data path access") as timer:
+            for _ in range(REPEAT):
+                for r in rows:
+                    r["run.suite.name"]
+                    r["run.timestamp"]
+                    r["build.branch"]
+        Log.note("Data path access: {{duration}}", duration=timer.duration)
+
+
+# THE PREVIOUS, UNCACHED, IMPLEMENTATIONS, FOR COMPARISON
+def _split_field(field):
+    if field == "." or field == None:
+        return []
+    elif "." in field:
+        if field.startswith(".."):
+            remainder = field.lstrip(".")
+            back = len(field) - len(remainder) - 1
+            return [-1] * back + [k.replace("\a", ".") for k in remainder.replace("\\.", "\a").split(".")]
+        else:
+            return [k.replace("\a", ".") for k in field.replace("\\.", "\a").split(".")]
+    else:
+        return [field]
+
+
+def _join_field(path):
+    output = ".".join([f.replace(".", "\\.") for f in path if f != None])
+    return output if output else "."
+
+
+def _concat_field(prefix, suffix):
+    if suffix.startswith(".."):
+        remainder = suffix.lstrip(".")
+        back = len(suffix) - len(remainder) - 1
+        prefix_path = _split_field(prefix)
+        if len(prefix_path) >= back:
+            return _join_field(_split_field(prefix)[:-back] + _split_field(remainder))
+        else:
+            return "." * (back - len(prefix_path)) + "." + remainder
+    else:
+        return _join_field(_split_field(prefix) + _split_field(suffix))
+
+
+def _relative_field(field, parent):
+    if parent == ".":
+        return field
+    field_path = _split_field(field)
+    parent_path = _split_field(parent)
+    common = 0
+    for f, p in zip(field_path, parent_path):
+        if f != p:
+            break
+        common += 1
+    if len(parent_path) == common:
+        return _join_field(field_path[common:])
+    else:
+        dots = "." * (len(parent_path) - common)
+        return dots + "." + _join_field(field_path[common:])
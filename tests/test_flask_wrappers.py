@@ -0,0 +1,73 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import gzip
+import zlib
+
+import flask
+from flask import Response
+
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from pyLibrary.env.flask_wrappers import Compressor, choose_encoding, gzip_wrapper
+
+BIG = b'{"data": [' + b", ".join(b'"value"' for _ in range(1000)) + b"]}"
+
+
+class TestFlaskWrappers(FuzzyTestCase):
+    def test_choose_encoding(self):
+        self.assertEqual(choose_encoding("gzip, deflate"), "gzip")
+        self.assertEqual(choose_encoding("gzip;q=0.5, deflate"), "deflate")
+        self.assertEqual(choose_encoding("*"), choose_encoding("gzip, deflate, br, zstd"))
+        self.assertTrue(choose_encoding("identity") is None)
+        self.assertTrue(choose_encoding("gzip;q=0") is None)
+        self.assertTrue(choose_encoding(None) is None)
+
+    def test_stream(self):
+        compressor = Compressor("deflate")
+        compressed = b"".join(compressor.stream(iter([BIG[:100], BIG[100:]])))
+        self.assertEqual(zlib.decompress(compressed), BIG)
+        self.assertEqual(compressor.timing, {"encoding": "deflate", "level": 6})
+
+    def test_wrapper(self):
+        app = flask.Flask("test")
+
+        @gzip_wrapper
+        def big():
+            return Response(BIG, status=200)
+
+        @gzip_wrapper
+        def small():
+            return Response(b"{}", status=200)
+
+        @gzip_wrapper
+        def streamed():
+            return Response(iter([BIG, BIG]), status=200)
+
+        with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+            response = big()
+            self.assertEqual(response.headers["Content-Encoding"], "gzip")
+            self.assertEqual(gzip.decompress(response.get_data()), BIG)
+            self.assertTrue(len(response.get_data()) < len(BIG))
+
+            response = small()
+            self.assertTrue("Content-Encoding" not in response.headers)
+            self.assertEqual(response.get_data(), b"{}")
+
+        with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+            response = streamed()
+            self.assertEqual(response.headers["Content-Encoding"], "gzip")
+            self.assertEqual(gzip.decompress(b"".join(response.response)), BIG + BIG)
+
+        with app.test_request_context():
+            response = big()
+            self.assertTrue("Content-Encoding" not in response.headers)
+            self.assertEqual(response.get_data(), BIG)
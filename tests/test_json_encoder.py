@@ -0,0 +1,110 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import random
+from datetime import datetime
+from decimal import Decimal
+from unittest import skipIf
+
+from mo_dots import Data, FlatList, Null, wrap
+from mo_json import encoder, json2value
+from mo_logs import Log
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from mo_times import Date, Duration, Timer
+
+REPEAT = 5
+
+
+class TestJsonEncoder(FuzzyTestCase):
+    @skipIf(encoder.orjson_dumps is None, "orjson not installed")
+    def test_same_as_scrubbed(self):
+        value = wrap({
+            "text": "a \"quoted\"\n\u2014 line\u2028\x00\x1f\x7f",
+            "blank": "  ",
+            "date": Date("2019-01-01 12:00:00"),
+            "datetime": datetime(2019, 1, 1),
+            "duration": Duration("day"),
+            "decimal": Decimal("1.5"),
+            "set": {1},
+            "null": Null,
+            "none": None,
+            "nan": float("nan"),
+            "floats": [1.0, 2.5, -0.0, 1e16, 1.5e300, float("inf"), 0.0001, None, "  "],
+            "ints": [True, 0, -7, 2 ** 53, 2 ** 53 + 1, 2 ** 62 + 1],
+            "list": FlatList([Data(a=1), {"b": [1, 2.5, None]}, (3.0, "x")]),
+            "nested": {"data": Data(c=Data(d="e", f=None)), "empty": {}, "\u00e9\u00e8": []},
+        })
+        self.assertEqual(encoder.orjson_encode(value), encoder._scrubbing_encoder(value))
+
+        value = {"a": None, "b": 1.0, "c": [1.0, None]}
+        self.assertEqual(encoder.orjson_encode(value), '{"b":1,"c":[1,null]}')
+        self.assertEqual(encoder.orjson_encode(Date("2020-01-01")), "1577836800")
+
+    @skipIf(encoder.orjson_dumps is None, "orjson not installed")
+    def test_exponent_floats(self):
+        value = {"small": [1e-05, -2.5e-10], "data": Data(x=1.5e-7)}
+        self.assertEqual(encoder.orjson_encode(value), encoder._scrubbing_encoder(value))
+
+    @skipIf(encoder.orjson_dumps is None, "orjson not installed")
+    def test_same_as_scrubbed_sample(self):
+        value = _sample(1000)
+        self.assertEqual(encoder.orjson_encode(value), encoder._scrubbing_encoder(value))
+
+    @skipIf(encoder.orjson_dumps is None, "orjson not installed")
+    def test_falls_back(self):
+        value = {"big": 2 ** 70, "deep": _deep(300)}
+        self.assertEqual(encoder.orjson_encode(value), encoder._scrubbing_encoder(value))
+
+    def test_python_encoder_escapes(self):
+        value = {"a\tb": ["\"quoted\"\n", b"bytes\x01"]}
+        self.assertEqual(json2value(encoder.pypy_json_encode(value)), {"a\tb": ["\"quoted\"\n", "bytes\x01"]})
+
+    @skipIf(encoder.orjson_dumps is None, "orjson not installed")
+    def test_speed(self):
+        value = _sample(20000)
+        with Timer("scrub, then encode") as scrubbed:
+            for _ in range(REPEAT):
+                encoder._scrubbing_encoder(value)
+        with Timer("clean, then orjson") as one_pass:
+            for _ in range(REPEAT):
+                encoder.orjson_encode(value)
+        Log.note(
+            "scrub then encode took {{scrubbed}}, clean then orjson took {{one_pass}}",
+            scrubbed=scrubbed.duration,
+            one_pass=one_pass.duration,
+        )
+        self.assertLess(one_pass.duration.seconds, scrubbed.duration.seconds)
+
+
+def _deep(depth):
+    output = 1
+    for _ in range(depth):
+        output = [output]
+    return output
+
+
+def _sample(num):
+    random.seed(42)
+    return Data(
+        data=FlatList([
+            Data(
+                name=random.choice(["alpha", "beta", "gamma — \"quoted\""]),
+                value=random.random(),
+                count=random.randint(0, 1000),
+                timestamp=Date(random.randint(0, 2 ** 31)),
+                duration=Duration(random.randint(1, 1000)),
+                tags=FlatList(["a", "b"]),
+            )
+            for _ in range(num)
+        ]),
+        meta={"format": "list"},
+    )
@@ -0,0 +1,151 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import gc
+import json
+from threading import Thread
+
+from jx_elasticsearch.elasticsearch import Cluster
+from mo_files import URL
+from mo_http.session_pool import SessionPool
+from mo_json.stream import parse_head
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+
+NUM_MEMBERS = 1000
+
+RESPONSE = (
+    '{"took": 12, "timed_out": false, "_shards": {"total": 5, "failed": 0},\n'
+    ' "hits": {"total": 123456789, "max_score": -1.5e-3, "hits": [\n'
+    '  {"_id": "a\\"b\\\\c", "_source": {"name": "caf\\u00e9 été 漢字 \\ud83d\\ude00 \U0001f600", "value": 1234567.125}},\n'
+    '  {"_id": "2", "_source": {"value": -98765, "small": 1.5E+10, "tiny": 2e-7, "list": [1, 22, 333]}},\n'
+    '  {"_id": "3", "_source": {"value": 0, "flag": true, "none": null, "empty": {}, "tab": "a\\tb\\nc\\/d"}},\n'
+    '  12345,\n'
+    '  "text",\n'
+    '  1.25\n'
+    ' ]}, "aggregations": {"not": "decoded"}}'
+)
+
+
+class TestJsonStream(FuzzyTestCase):
+    def test_every_chunk_boundary(self):
+        data = RESPONSE.encode("utf8")
+        expected = json.loads(RESPONSE)
+        expected_members = expected["hits"].pop("hits")
+        del expected["aggregations"]
+
+        # EVERY KEY, STRING, ESCAPE, MULTI-BYTE CHARACTER AND NUMBER IS SPLIT
+        # BY SOME CHUNK SIZE, AT SOME OFFSET
+        for size in list(range(1, 20)) + [64, 1000]:
+            for offset in range(min(size, 7)):
+                head, members = parse_head(_chunks(data, size, offset), "hits.hits")
+                self.assertTrue(head == expected, "for size " + str(size) + " offset " + str(offset))
+                self.assertTrue(list(members) == expected_members, "for size " + str(size) + " offset " + str(offset))
+
+    def test_members_are_lazy(self):
+        data = ('{"hits": {"hits": [' + ",".join('{"_id": ' + str(i) + "}" for i in range(NUM_MEMBERS)) + "]}}").encode("utf8")
+        requested = []
+
+        def get_more():
+            output = data[len(requested) : len(requested) + 10]
+            requested.extend(output)
+            return output
+
+        head, members = parse_head(get_more, "hits.hits")
+        self.assertEqual(next(members)._id, 0)
+        self.assertLess(len(requested), 100)
+        self.assertEqual([m._id for m in members], list(range(1, NUM_MEMBERS)))
+
+    def test_empty_array(self):
+        head, members = parse_head(_chunks(b'{"a": 1, "b": {"c": []}, "d": 2}', 3), "b.c")
+        self.assertTrue(head == {"a": 1, "b": {}})
+        self.assertEqual(list(members), [])
+
+    def test_missing_array(self):
+        head, members = parse_head(_chunks(b'{"a": 1.5, "b": {"x": "y"}}', 2), "b.c")
+        self.assertTrue(head == {"a": 1.5, "b": {"x": "y"}})
+        self.assertEqual(list(members), [])
+
+    def test_number_at_end(self):
+        head, members = parse_head(_chunks(b'{"a": [1e5, -0.25, 100]}', 1), "a")
+        self.assertTrue(list(members) == [100000.0, -0.25, 100])
+
+
+class TestPostStream(FuzzyTestCase):
+    """
+    post_stream() AGAINST A LOCAL HTTP SERVER, NO ELASTICSEARCH NEEDED
+    """
+
+    def setUp(self):
+        self.server = HTTPServer(("127.0.0.1", 0), _SearchHandler)
+        self.thread = Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.cluster = object.__new__(Cluster)
+        self.cluster.url = URL("http://127.0.0.1:" + str(self.server.server_address[1]))
+        self.cluster.debug = False
+        self.cluster.sessions = SessionPool(name="test", pool_size=2)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.cluster.sessions.close()
+
+    def test_read_all(self):
+        details, members = self.cluster.post_stream("/_search", "hits.hits", data={})
+        self.assertEqual(details.hits.total, 3)
+        self.assertTrue([m._id for m in members] == [0, 1, 2])
+        self.assertEqual(self.cluster.sessions.stats.idle, 1)
+
+    def test_never_iterated(self):
+        details, members = self.cluster.post_stream("/_search", "hits.hits", data={})
+        self.assertEqual(self.cluster.sessions.stats.idle, 0)
+        members.close()
+        self.assertEqual(self.cluster.sessions.stats.unhealthy, 1)
+        self.assertEqual(list(members), [])
+
+        # DROPPED WITHOUT A close()
+        details, members = self.cluster.post_stream("/_search", "hits.hits", data={})
+        del members
+        gc.collect()
+        self.assertEqual(self.cluster.sessions.stats.unhealthy, 2)
+
+
+class _SearchHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps({"hits": {"total": 3, "hits": [{"_id": i} for i in range(3)]}}).encode("utf8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _chunks(data, size, offset=0):
+    """
+    :return: FUNCTION RETURNING THE NEXT CHUNK OF data, THE FIRST CHUNK IS offset BYTES SHORT
+    """
+    ends = list(range(size - offset, len(data), size)) + [len(data)]
+    chunks = iter([data[s:e] for s, e in zip([0] + ends, ends)] + [b""])
+
+    def get_more():
+        return next(chunks, b"")
+
+    return get_more
@@ -181,3 +181,58 @@ class TestBulk(BaseTestCase):
             sorted_content = jx.sort(content.data, 0)
             sorted_expected = [(row.a,) for row in expected]
             self.assertEqual(sorted_content, sorted_expected)
+
+    def test_stream_query_list(self):
+        data = wrap([{"a": "test" + text(i)} for i in range(10111)])
+        expected = jx.sort(data, "a")
+
+        test = wrap(
+            {
+                "data": data,
+                "query": {
+                    "from": TEST_TABLE,
+                    "limit": len(data),
+                    "chunk_size": 1000,
+                    "sort": "a",
+                },
+                "expecting_list": {
+                    "data": expected[:MAX_LIMIT]
+                },  # DUMMY, TO ENSURE LOADED
+            }
+        )
+        self.utils.execute_tests(test)
+
+        test.query.format = "list"
+        test.query.destination = "stream"
+        result = http.post_json(url=self.utils.testing.query, json=test.query,)
+        self.assertEqual(result.meta.format, "list")
+        self.assertGreater(result.meta.timing.total, 0)
+        self.assertEqual(result.data, expected)
+
+    def test_stream_query_table(self):
+        data = wrap([{"a": "test" + text(i)} for i in range(10111)])
+        expected = jx.sort(data, "a")
+
+        test = wrap(
+            {
+                "data": data,
+                "query": {
+                    "from": TEST_TABLE,
+                    "select": ["a"],
+                    "limit": len(data),
+                    "chunk_size": 1000,
+                    "sort": "a",
+                },
+                "expecting_list": {
+                    "data": expected[:MAX_LIMIT]
+                },  # DUMMY, TO ENSURE LOADED
+            }
+        )
+        self.utils.execute_tests(test)
+
+        test.query.format = "table"
+        test.query.destination = "stream"
+        result = http.post_json(url=self.utils.testing.query, json=test.query,)
+        self.assertEqual(result.header, ["a"])
+        self.assertEqual(result.meta.format, "table")
+        self.assertEqual(result.data, [(row.a,) for row in expected])
@@ -56,6 +56,33 @@ class TestExpressions(FuzzyTestCase):
         expected = (Date.today() - MONTH).unix
         self.assertEqual(result, expected)
 
+    def test_compiled_function_is_cached(self):
+        from jx_python.expression_compiler import compiled
+        from jx_python.expressions import jx_expression_to_function, warm_up
+
+        expr = {"add": ["a", {"mul": ["b", 3]}]}
+        self.assertEqual(warm_up([{"select": {"value": expr}, "where": {"eq": {"a": 1}}}]), 2)
+
+        hits = compiled.stats.hits
+        func = jx_expression_to_function({"add": [{"mul": ["b", 3]}, "a"]})
+        self.assertEqual(compiled.stats.hits, hits, "expecting different expression to miss")
+        self.assertEqual(func({"a": 1, "b": 2}), 7)
+
+        func = jx_expression_to_function(expr)
+        self.assertEqual(compiled.stats.hits, hits + 1)
+        self.assertEqual(func({"a": 1, "b": 2}), 7)
+
+    def test_cache_shared_by_json_and_expression(self):
+        from jx_python.expressions import jx_expression_to_function
+
+        expr = {"in": {"a": [11, 13]}}
+        func = jx_expression_to_function(jx_expression(expr))
+        self.assertEqual(func({"a": 11}), True)
+        func = jx_expression_to_function(expr)
+        self.assertEqual(func({"a": 12}), False)
+        func = jx_expression_to_function(jx_expression(expr))
+        self.assertEqual(func({"a": 13}), True)
+
     def test_null_startswith(self):
         filter = jx_expression(
             {"prefix": [{"null": {}}, {"literal": "something"}]}
@@ -0,0 +1,88 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import random
+from unittest import skipIf
+
+from jx_base.query import QueryOp
+from jx_python.containers.list_usingPythonList import ListContainer
+from jx_python.lists import columnar
+from mo_json import value2json
+from mo_logs import Log
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from mo_times import Timer
+
+AGGREGATES = ["count", "sum", "min", "max", "average", "median"]
+
+
+class TestPythonAggs(FuzzyTestCase):
+    def setUp(self):
+        self.min_rows = columnar.COLUMNAR_MIN_ROWS
+
+    def tearDown(self):
+        columnar.COLUMNAR_MIN_ROWS = self.min_rows
+
+    def test_average(self):
+        container = ListContainer("test", [{"a": 1, "v": 2}, {"a": 1, "v": 4}, {"a": 2, "v": None}])
+        result = _query(container, {
+            "from": "test",
+            "edges": ["a"],
+            "select": {"value": "v", "aggregate": "average"},
+        })
+        self.assertEqual([v for _, v in result.data["v"]], [3, None, None])
+
+    @skipIf(columnar.numpy is None, "numpy not installed")
+    def test_columnar_matches_rows(self):
+        container, query = _sample(3000)
+        columnar.COLUMNAR_MIN_ROWS = 0
+        vectorized = _query(container, query)
+        columnar.COLUMNAR_MIN_ROWS = float("inf")
+        expected = _query(container, query)
+        self.assertEqual(value2json(vectorized), value2json(expected))
+
+    @skipIf(columnar.numpy is None, "numpy not installed")
+    def test_columnar_speed(self):
+        container, query = _sample(20000)
+        columnar.COLUMNAR_MIN_ROWS = 0
+        with Timer("columnar aggs") as vectorized:
+            _query(container, query)
+        columnar.COLUMNAR_MIN_ROWS = float("inf")
+        with Timer("row aggs") as rows:
+            _query(container, query)
+        Log.note(
+            "columnar took {{columnar}}, rows took {{rows}}",
+            columnar=vectorized.duration,
+            rows=rows.duration,
+        )
+
+
+def _sample(num):
+    random.seed(42)
+    data = [
+        {
+            "a": random.choice(["x", "y", "z", None]),
+            "b": random.choice([1, 2, 3]),
+            "v": random.choice([None, 1, 2.5, 7, -3]),
+        }
+        for _ in range(num)
+    ]
+    query = {
+        "from": "test",
+        "edges": ["a", "b"],
+        "select": [{"name": a, "value": "v", "aggregate": a} for a in AGGREGATES]
+        + [{"name": "p90", "value": "v", "aggregate": "percentile", "percentile": 0.9}],
+    }
+    return ListContainer("test", data), query
+
+
+def _query(container, query):
+    return container.query(QueryOp.wrap(query, container, container))
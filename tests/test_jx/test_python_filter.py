@@ -0,0 +1,96 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+from jx_python import jx
+from jx_python.containers.list_usingPythonList import ListContainer
+from jx_python.expressions import jx_expression_to_function
+from jx_python.predicates import compile_predicate
+from mo_dots import unwrap, wrap
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+DATA = [
+    {"i": 0, "a": "x", "b": 1, "c": {"d": 3}},
+    {"i": 1, "a": "y", "b": 2, "c": {"d": None}},
+    {"i": 2, "a": None, "b": 3.5, "c": {}},
+    {"i": 3, "a": "xyz", "b": None, "c": {"d": [1, 2]}},
+    {"i": 4, "a": ["x", "y"], "b": 5, "c": {"d": 4}},
+    {"i": 5, "a": "", "b": "7"},
+    {"i": 6, "a": [], "b": -1},
+]
+
+FILTERS = [
+    {"eq": {"a": "x"}},
+    {"eq": {"c.d": 3}},
+    {"eq": {"a": "x", "b": 1}},
+    {"in": {"a": ["y", "xyz"]}},
+    {"in": {"b": [1, 5]}},
+    {"exists": "a"},
+    {"exists": "c.d"},
+    {"missing": "a"},
+    {"missing": "c.d"},
+    {"prefix": {"a": "x"}},
+    {"gt": {"b": 1}},
+    {"gte": {"b": 2}},
+    {"lt": {"b": 3}},
+    {"lte": {"c.d": 3}},
+    {"not": {"eq": {"a": "x"}}},
+    {"and": [{"exists": "b"}, {"lt": {"b": 5}}, {"eq": {"a": "y"}}]},
+    {"or": [{"eq": {"a": "x"}}, {"gt": {"b": 3}}, {"missing": "c"}]},
+    {"and": [{"or": [{"prefix": {"a": "x"}}, {"eq": {"b": 2}}]}, {"not": {"missing": "c"}}]},
+    {"eq": [{"mod": ["i", 2]}, 0]},
+]
+
+
+class TestPythonFilter(FuzzyTestCase):
+    def test_same_as_general(self):
+        for where in FILTERS:
+            predicate = compile_predicate(where)
+            self.assertTrue(predicate is not None)
+            general = jx_expression_to_function(where)
+            rows = wrap(DATA)
+            for i, row in enumerate(DATA):
+                try:
+                    expected = bool(general(wrap(row), i, rows))
+                except Exception:
+                    # THE GENERAL PATH CAN NOT prefix A null, OR A LIST
+                    continue
+                self.assertEqual(predicate(row), expected, "expecting same result for " + str(where) + " on row " + str(i))
+
+    def test_prefix_of_null(self):
+        self.assertEqual(unwrap(jx.filter(DATA[:4], {"prefix": {"a": "x"}})), [DATA[0], DATA[3]])
+
+    def test_reordered_term_on_mixed_types(self):
+        # THE gt IS EVALUATED FIRST, AND DOES NOT MATCH TEXT IT CAN NOT COMPARE
+        rows = [{"a": "a"}, {"a": 2}, {"a": "b"}]
+        where = {"or": [{"eq": {"a": "a"}}, {"not": {"gt": {"a": 1}}}]}
+        self.assertTrue(unwrap(jx.filter(rows, where)) == [{"a": "a"}, {"a": "b"}])
+        self.assertTrue(unwrap(jx.filter(rows, {"and": [{"prefix": {"a": "a"}}, {"gt": {"a": 1}}]})) == [])
+        self.assertTrue(unwrap(jx.filter([{"a": 5}], {"prefix": {"a": "5"}})) == [])
+
+    def test_row_variables_are_not_compiled(self):
+        self.assertEqual(compile_predicate({"eq": {"rownum": 2}}), None)
+        self.assertEqual(unwrap(jx.filter(DATA, {"gte": {"rownum": 5}})), DATA[5:])
+
+    def test_filter_list(self):
+        result = jx.filter(DATA, {"and": [{"exists": "a"}, {"gt": {"b": 1}}]})
+        self.assertEqual(result.i, [1, 4])
+
+    def test_filter_iterator(self):
+        result = jx.filter(iter(DATA), {"eq": {"a": "x"}})
+        self.assertFalse(isinstance(result, list))
+        self.assertEqual([r["i"] for r in result], [0, 4])
+
+    def test_list_container(self):
+        container = ListContainer("test", DATA)
+        result = container.where({"in": {"a": ["x", "y"]}})
+        self.assertEqual([r["i"] for r in result.data], [0, 1])
+
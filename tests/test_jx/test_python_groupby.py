@@ -0,0 +1,51 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+from jx_python import jx
+from jx_python.containers.list_usingPythonList import ListContainer
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+DATA = [
+    {"a": "y", "b": 2, "i": 0},
+    {"a": "x", "b": 1, "i": 1},
+    {"a": None, "b": 1, "i": 2},
+    {"a": "y", "b": 2, "i": 3},
+    {"a": "x", "b": 2, "i": 4},
+]
+
+
+class TestPythonGroupby(FuzzyTestCase):
+    def test_sorted_groups(self):
+        result = [(g.a, g.b, members.i) for g, members in jx.groupby(DATA, ["a", "b"])]
+        self.assertEqual(result, [("x", 1, [1]), ("x", 2, [4]), ("y", 2, [0, 3]), (None, 1, [2])])
+
+    def test_first_seen_groups(self):
+        result = [(g.a, members.i) for g, members in jx.groupby(DATA, "a", sort=False)]
+        self.assertEqual(result, [("y", [0, 3]), ("x", [1, 4]), (None, [2])])
+
+    def test_contiguous_from_iterator(self):
+        result = [(g.b, members.i) for g, members in jx.groupby(iter(DATA), "b", contiguous=True)]
+        self.assertEqual(result, [(2, [0]), (1, [1, 2]), (2, [3, 4])])
+
+    def test_expression_keys(self):
+        key = {"name": "even", "value": {"eq": [{"mod": ["i", 2]}, 0]}}
+        result = [(g.even, members.i) for g, members in jx.groupby(DATA, key)]
+        self.assertEqual(result, [(False, [1, 3]), (True, [0, 2, 4])])
+
+    def test_values(self):
+        result = [(g, len(members)) for g, members in jx.groupby([3, 1, 3, None, 1, 3])]
+        self.assertEqual(result, [(1, 2), (3, 3), (None, 1)])
+
+    def test_list_container(self):
+        container = ListContainer("test", DATA)
+        result = [(g.a, members.i) for g, members in container.groupby(["a"])]
+        self.assertEqual(result, [("x", [1, 4]), ("y", [0, 3]), (None, [2])])
@@ -0,0 +1,70 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import random
+from functools import cmp_to_key
+
+from jx_base import query
+from jx_base.language import value_compare
+from jx_python import jx
+from jx_python.expressions import jx_expression_to_function
+from mo_dots import Null
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from mo_times import Date
+
+
+class TestPythonSort(FuzzyTestCase):
+    def test_mixed_types(self):
+        values = [None, Null, float("nan"), 1, 2, 2.5, -3, True, False, "a", "b", "", Date("2019-01-01")]
+        random.seed(42)
+        data = [
+            {"a": random.choice(values), "b": random.choice(values), "i": i}
+            for i in range(300)
+        ]
+        for sort in [["a", "b"], [{"a": "desc"}, "b"], [{"b": "desc"}, {"a": "desc"}]]:
+            expected = [d["i"] for d in _sort_using_cmp(data, sort)]
+            result = [d["i"] for d in jx.sort(data, sort)]
+            self.assertEqual(result, expected, "expecting same order for " + str(sort))
+
+    def test_lists(self):
+        data = [{"a": v, "i": i} for i, v in enumerate([[1, 2], 3, [0, 5], 2, [2], 1])]
+        expected = [d["i"] for d in _sort_using_cmp(data, ["a"])]
+        result = [d["i"] for d in jx.sort(data, "a")]
+        self.assertEqual(result, expected)
+
+    def test_nulls_last(self):
+        self.assertEqual(jx.sort([3, None, 1, 2]), [1, 2, 3, None])
+        self.assertEqual(
+            jx.sort([{"a": 3}, {"a": None}, {"a": 1}], {"a": "desc"}).a,
+            [3, 1, None]
+        )
+
+    def test_stable(self):
+        data = [{"a": i % 3, "i": i} for i in range(30)]
+        result = jx.sort(data, {"a": "desc"})
+        self.assertEqual(result.i, [i for a in (2, 1, 0) for i in range(30) if i % 3 == a])
+
+
+def _sort_using_cmp(data, sort):
+    """
+    THE ORIGINAL, ONE-COMPARISON-AT-A-TIME, SORT
+    """
+    funcs = [(jx_expression_to_function(s.value), s.sort) for s in query._normalize_sort(sort)]
+
+    def comparer(left, right):
+        for func, ordering in funcs:
+            result = value_compare(func(left), func(right), ordering)
+            if result != 0:
+                return result
+        return 0
+
+    return sorted(data, key=cmp_to_key(comparer))
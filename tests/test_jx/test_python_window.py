@@ -0,0 +1,91 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import random
+
+from jx_base.query import QueryOp
+from jx_python import windows
+from jx_python.containers.list_usingPythonList import ListContainer
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+
+class TestPythonWindow(FuzzyTestCase):
+    def test_sliding_max(self):
+        random.seed(42)
+        values = [random.choice([None, 1, 2, 3, 4, 5]) for _ in range(200)]
+        result = _window(
+            [{"i": i, "v": v} for i, v in enumerate(values)],
+            {"name": "m", "value": "v", "aggregate": "max", "sort": "i", "range": {"min": -3, "max": 1}},
+        )
+        expected = [_max(values[max(i - 3, 0):i + 1]) for i in range(len(values))]
+        self.assertEqual([r["m"] for r in result], expected)
+
+    def test_sliding_min(self):
+        values = [5, 3, 3, 4, None, 1, 2, 2, 6]
+        total = windows.SlidingMin()
+        output = []
+        for i, v in enumerate(values):
+            total.add(v)
+            if i >= 2:
+                output.append(total.end())
+                total.sub(values[i - 2])
+        self.assertEqual(output, [3, 3, 3, 1, 1, 1, 2])
+
+    def test_running_max(self):
+        # AGGREGATES NEVER sub(), SO KEEP ONLY THE MAXIMUM
+        total = windows.name2accumulator["max"]()
+        for v in range(1000):
+            total.add(v)
+        total.add(None)
+        self.assertEqual(total.end(), 999)
+        self.assertFalse(hasattr(total, "candidates"))
+
+        lowest = windows.name2accumulator["min"]()
+        for v in [3, None, 1, 2]:
+            lowest.add(v)
+        self.assertEqual(lowest.end(), 1)
+
+    def test_expression_edges(self):
+        data = [{"i": i, "v": i} for i in range(10)]
+        result = _window(
+            data,
+            {
+                "name": "total",
+                "value": "v",
+                "edges": [{"name": "odd", "value": {"mod": ["i", 2]}}],
+                "sort": "i",
+                "aggregate": "sum",
+                "range": {"max": 1},
+            },
+        )
+        self.assertEqual([r["total"] for r in result], [0, 1, 2, 4, 6, 9, 12, 16, 20, 25])
+        self.assertTrue(all("__temp__" not in r for r in result))
+
+    def test_rownum_per_partition(self):
+        data = [{"a": a, "i": i} for i, a in enumerate("xyxyx")]
+        result = _window(
+            data,
+            {"name": "n", "value": "rownum", "edges": ["a"], "sort": {"i": "desc"}},
+        )
+        self.assertEqual([r["n"] for r in result], [2, 1, 1, 0, 0])
+
+
+def _max(values):
+    values = [v for v in values if v is not None]
+    return max(values) if values else None
+
+
+def _window(data, window):
+    container = ListContainer("test", data)
+    query = QueryOp.wrap({"from": "test", "window": window}, container, container)
+    container.query(query)
+    return data
@@ -15,6 +15,7 @@ from unittest import skip, skipIf
 from jx_base.expressions import NULL
 from jx_base.query import DEFAULT_LIMIT, MAX_LIMIT
 from mo_dots import wrap
+from mo_future import text
 import mo_math
 from tests.test_jx import BaseTestCase, TEST_TABLE, global_settings
 
@@ -739,6 +740,29 @@ class TestSetOps(BaseTestCase):
         }
         self.utils.execute_tests(test)
 
+    def test_select_large_limit(self):
+        # LARGE LIMITS ARE DECODED AS THEY ARE FORMATTED
+        num = 1200
+        test = {
+            "data": [{"a": i, "b": text(i)} for i in range(num)],
+            "query": {
+                "from": TEST_TABLE,
+                "select": ["a", "b"],
+                "sort": "a",
+                "limit": 2000
+            },
+            "expecting_list": {
+                "meta": {"format": "list"},
+                "data": [{"a": i, "b": text(i)} for i in range(num)]
+            },
+            "expecting_table": {
+                "meta": {"format": "table"},
+                "header": ["a", "b"],
+                "data": [[i, text(i)] for i in range(num)]
+            }
+        }
+        self.utils.execute_tests(test)
+
     def test_select_w_deep_star(self):
         test = {
             "data": [
@@ -0,0 +1,142 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import os
+
+from mo_collections import persistent_queue
+from mo_collections.persistent_queue import PersistentQueue
+from mo_files import File, TempDirectory
+from mo_future import text
+from mo_json import value2json
+from mo_logs import Log
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from mo_threads import Thread
+from mo_times import Timer
+
+NUM_THREADS = 20
+NUM_ADDS = 1000
+
+
+class TestPersistentQueue(FuzzyTestCase):
+    def setUp(self):
+        self.temp = TempDirectory()
+        self.filename = self.temp.abspath + "/queue.json"
+
+    def tearDown(self):
+        self.temp.delete()
+
+    def segment_files(self):
+        return sorted(f for f in os.listdir(self.temp.abspath) if f.endswith(".log"))
+
+    def test_commit_and_reopen(self):
+        queue = PersistentQueue(self.filename)
+        for i in range(5):
+            queue.add({"i": i})
+        self.assertEqual(queue.pop(), {"i": 0})
+        self.assertEqual(queue.pop(), {"i": 1})
+        queue.commit()
+        queue.rollback()
+        self.assertEqual(queue.pop(), {"i": 2})
+        queue.close()  # ALSO COMMITS
+
+        queue = PersistentQueue(self.filename)
+        self.assertEqual(len(queue), 2)
+        self.assertEqual(queue.pop_all(), [{"i": 3}, {"i": 4}])
+        queue.rollback()
+        self.assertEqual(queue.pop(), {"i": 3})
+        queue.commit()
+        queue.pop_all()
+        queue.close()
+        self.assertEqual(os.listdir(self.temp.abspath), [])
+
+    def test_recover_after_crash(self):
+        queue = PersistentQueue(self.filename)
+        for i in range(10):
+            queue.add(i)
+        for i in range(4):
+            queue.pop()
+        queue.commit()
+        queue.pop()  # NOT COMMITTED
+
+        # A WRITE INTERRUPTED PART WAY
+        with open(self.temp.abspath + "/" + self.segment_files()[-1], "ab") as f:
+            f.write(b'{"i":')
+
+        queue = PersistentQueue(self.filename)
+        self.assertEqual(len(queue), 6)
+        queue.add(10)
+        queue = PersistentQueue(self.filename)
+        self.assertEqual(queue.pop_all(), list(range(4, 11)))
+
+    def test_consumed_segments_are_deleted(self):
+        old_size, persistent_queue.SEGMENT_SIZE = persistent_queue.SEGMENT_SIZE, 10
+        try:
+            queue = PersistentQueue(self.filename)
+            queue.extend(range(35))
+            self.assertEqual(len(self.segment_files()), 4)
+            for i in range(25):
+                queue.pop()
+            queue.commit()
+            self.assertEqual(self.segment_files(), ["queue.json.20.log", "queue.json.30.log"])
+
+            queue = PersistentQueue(self.filename)
+            self.assertEqual(queue.pop_all(), list(range(25, 35)))
+            queue.commit()
+            self.assertEqual(self.segment_files(), ["queue.json.30.log"])
+        finally:
+            persistent_queue.SEGMENT_SIZE = old_size
+
+    def test_upgrade_old_format(self):
+        File(self.filename).write(
+            "\n".join(
+                value2json(d)
+                for d in [
+                    {"add": {"status.start": 0, "status.end": 0}},
+                    {"add": {"0": "a"}},
+                    {"add": {"status.end": 1}},
+                    {"add": {"1": "b"}},
+                    {"add": {"status.end": 2}},
+                    {"add": {"2": "c"}},
+                    {"add": {"status.end": 3}},
+                    {"add": {"status.start": 1}},
+                    {"remove": "0"},
+                ]
+            )
+        )
+        queue = PersistentQueue(self.filename)
+        self.assertFalse(File(self.filename).exists)
+        self.assertEqual(queue.pop_all(), ["b", "c"])
+
+    def test_pop_timeout(self):
+        queue = PersistentQueue(self.filename)
+        self.assertTrue(queue.pop(timeout=0.1) is None)
+
+    def test_concurrent_adds(self):
+        queue = PersistentQueue(self.filename)
+
+        def producer(n, please_stop):
+            for i in range(NUM_ADDS):
+                queue.add({"n": n, "i": i})
+
+        with Timer("add {{num}} records", param={"num": NUM_THREADS * NUM_ADDS}) as timer:
+            threads = [Thread.run("producer " + text(n), producer, n) for n in range(NUM_THREADS)]
+            for t in threads:
+                t.join()
+        Log.note("{{rate|round(places=3)}} records per second", rate=NUM_THREADS * NUM_ADDS / timer.duration.seconds)
+
+        queue = PersistentQueue(self.filename)
+        self.assertEqual(len(queue), NUM_THREADS * NUM_ADDS)
+        seen = [[] for _ in range(NUM_THREADS)]
+        for v in queue.pop_all():
+            seen[v.n].append(v.i)
+        for s in seen:
+            self.assertEqual(s, list(range(NUM_ADDS)))
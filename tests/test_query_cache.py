@@ -0,0 +1,104 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import flask
+
+from active_data.actions import query
+from jx_base import Column
+from jx_base.expressions import Variable
+from jx_base.query import QueryOp
+from jx_elasticsearch.meta_columns import ColumnList
+from mo_dots import wrap
+from mo_json import json2value, value2json
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from mo_times import Date
+
+
+class TestQueryCache(FuzzyTestCase):
+    """
+    _cache_key() ONLY, NO ELASTICSEARCH NEEDED
+    """
+
+    def setUp(self):
+        self.data_generation = query.data_generation
+        query.data_generation = lambda frum: (("testing_20200101",), 1577836800)
+
+    def tearDown(self):
+        query.data_generation = self.data_generation
+
+    def test_same_query_same_key(self):
+        self.assertEqual(_key({"format": "list"}), _key({"format": "list"}))
+
+    def test_format_has_own_entry(self):
+        self.assertNotEqual(_key({"format": "list"}), _key({"format": "table"}))
+        self.assertNotEqual(_key({"format": "list"}), _key({}))
+
+    def test_destination_is_not_cached(self):
+        self.assertTrue(_key({"format": "list"}) is not None)
+        for destination in ["url", "s3", "stream"]:
+            self.assertTrue(_key({"format": "list", "destination": destination}) is None, "for " + destination)
+
+    def test_bypass(self):
+        self.assertTrue(_key({"format": "list", "meta": {"cache": False}}) is None)
+        self.assertTrue(_key({"format": "list", "meta": {"save": True}}) is None)
+
+    def test_meta_columns_query(self):
+        # ListContainer RESULTS HAVE NO meta.timing
+        columns = ColumnList(FakeCluster())
+        columns.updater.stop()
+        columns.updater.join()
+        columns.add(Column(
+            name="a",
+            es_column="a",
+            es_index="testing",
+            es_type="keyword",
+            jx_type="string",
+            nested_path=(".",),
+            last_updated=Date.now(),
+        ))
+        find_container = query.find_container
+        query.find_container = lambda frum, after: columns.denormalized()
+        try:
+            app = flask.Flask(__name__)
+            app.add_url_rule("/query", None, query.jx_query, defaults={"path": ""}, methods=["POST"])
+            body = value2json({"from": "meta.columns", "select": ["table", "name"], "where": {"eq": {"table": "testing"}}, "format": "list"})
+            response = app.test_client().post("/query", data=body.encode("utf8"))
+        finally:
+            query.find_container = find_container
+
+        self.assertEqual(response.status_code, 200)
+        result = json2value(response.get_data().decode("utf8"))
+        self.assertEqual(result.data, [{"table": "testing", "name": "a"}])
+        self.assertTrue(result.meta.timing.total >= 0)
+
+
+class FakeCluster(object):
+    def get_index(self, id, index, type, read_only):
+        return self
+
+    def search(self, query):
+        return wrap({"hits": {"total": 0, "hits": []}})
+
+
+def _key(options):
+    data = wrap({"from": "testing", "select": ["a", "b"], "where": {"eq": {"a": 1}}})
+    data.format = options.get("format")
+    data.destination = options.get("destination")
+    data.meta = options.get("meta")
+    query_op = QueryOp(
+        frum=Variable(data["from"]),
+        select=data.select,
+        where=data.where,
+        format=data.format,
+        destination=data.destination,
+    )
+    return query._cache_key(data, query_op)
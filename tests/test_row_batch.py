@@ -0,0 +1,39 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+from jx_python.row_batch import RowBatch
+from mo_dots import Data, FlatList
+from mo_json import json2value, value2json
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+HEADER = ("name", "value", "child.name")
+
+
+class TestRowBatch(FuzzyTestCase):
+    def test_dictionary_encoding(self):
+        rows = [["a" + str(i % 3), i, "c" if i % 2 else None] for i in range(300)]
+        batch = RowBatch.from_rows(HEADER, rows)
+        self.assertEqual(batch.dictionaries[0], ["a0", "a1", "a2"])
+        self.assertEqual(batch.dictionaries[1], None)
+        self.assertEqual(batch.column(0), [r[0] for r in rows])
+        self.assertEqual(list(batch.rows()), [tuple(r) for r in rows])
+        self.assertEqual(batch[4], ("a1", 4, None))
+
+    def test_records(self):
+        batch = RowBatch.from_rows(HEADER, [["a", 1, "c"], [None, 2, None]])
+        result = Data(meta={"format": "list"}, data=FlatList(batch.records()))
+        expected = {"meta": {"format": "list"}, "data": [{"name": "a", "value": 1, "child": {"name": "c"}}, {"value": 2}]}
+
+        self.assertEqual(result.data.value, [1, 2])
+        self.assertEqual(result.data[0].child.name, "c")
+        self.assertEqual(json2value(value2json(result)), expected)
+        self.assertEqual(expected, json2value(value2json(result)))
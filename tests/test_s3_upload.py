@@ -0,0 +1,109 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import zlib
+
+from mo_testing.fuzzytestcase import FuzzyTestCase
+
+from pyLibrary.aws.s3 import MIN_PART_SIZE, MultipartUpload
+
+
+class TestMultipartUpload(FuzzyTestCase):
+
+    def test_small_upload(self):
+        bucket = LocalBucket()
+        with MultipartUpload(bucket, "a.json", content_type="application/json") as output:
+            output.write(b"{\"data\":[")
+            output.write(b"]}")
+
+        self.assertEqual(bucket.keys["a.json"], b"{\"data\":[]}")
+        self.assertEqual(bucket.headers["a.json"], {"Content-Type": "application/json"})
+
+    def test_parts_sent_while_writing(self):
+        bucket = LocalBucket()
+        row = b"x" * 1024
+        num_rows = (MIN_PART_SIZE // len(row)) * 3 + 10
+        with MultipartUpload(bucket, "a.json") as output:
+            for i in range(num_rows):
+                output.write(row)
+                if i == MIN_PART_SIZE // len(row):
+                    # FIRST PART IS SENT BEFORE THE FILE IS DONE
+                    self.assertEqual(len(bucket.uploads["a.json"].parts), 1)
+            self.assertNotIn("a.json", bucket.keys)
+
+        self.assertEqual(bucket.keys["a.json"], row * num_rows)
+        self.assertEqual(bucket.num_parts["a.json"], 4)
+
+    def test_compressed_upload(self):
+        bucket = LocalBucket()
+        content = b"".join(("{\"a\":" + str(i) + "}\n").encode("utf8") for i in range(100000))
+        with MultipartUpload(bucket, "a.json", compress=True) as output:
+            for i in range(0, len(content), 1000):
+                output.write(content[i:i + 1000])
+
+        self.assertEqual(bucket.headers["a.json"]["Content-Encoding"], "gzip")
+        self.assertEqual(zlib.decompress(bucket.keys["a.json"], 16 + zlib.MAX_WBITS), content)
+
+    def test_cancel_on_error(self):
+        bucket = LocalBucket()
+        try:
+            with MultipartUpload(bucket, "a.json") as output:
+                output.write(b"[")
+                raise Exception("problem")
+        except Exception:
+            pass
+
+        self.assertNotIn("a.json", bucket.keys)
+        self.assertTrue(bucket.uploads["a.json"].cancelled)
+
+
+class LocalBucket(object):
+    """
+    STAND-IN FOR A boto BUCKET, KEEPING THE KEYS IN MEMORY
+    """
+
+    def __init__(self):
+        self.keys = {}
+        self.headers = {}
+        self.num_parts = {}
+        self.uploads = {}
+
+    def initiate_multipart_upload(self, key, headers=None, policy=None):
+        upload = self.uploads[key] = LocalMultipartUpload(self, key, headers)
+        return upload
+
+
+class LocalMultipartUpload(object):
+
+    def __init__(self, bucket, key, headers):
+        self.bucket = bucket
+        self.key = key
+        self.headers = headers
+        self.parts = {}
+        self.cancelled = False
+
+    def upload_part_from_file(self, fp, part_num, size=None):
+        self.parts[part_num] = fp.read(size)
+
+    def complete_upload(self):
+        nums = sorted(self.parts.keys())
+        if nums != list(range(1, len(nums) + 1)):
+            raise Exception("missing parts")
+        for n in nums[:-1]:
+            if len(self.parts[n]) < MIN_PART_SIZE:
+                raise Exception("part too small")
+        self.bucket.keys[self.key] = b"".join(self.parts[n] for n in nums)
+        self.bucket.headers[self.key] = self.headers
+        self.bucket.num_parts[self.key] = len(nums)
+
+    def cancel_upload(self):
+        self.cancelled = True
@@ -0,0 +1,99 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import moz_sql_parser
+from active_data.actions.sql import parse_sql, parsed
+from mo_future import text
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from mo_threads import Thread
+
+NUM_THREADS = 8
+NUM_PARSES = 200
+NUM_ERRORS = 20
+
+
+class TestSQLParse(FuzzyTestCase):
+    """
+    PARSING ONLY, NO ELASTICSEARCH NEEDED
+    """
+
+    def test_parse_is_cached(self):
+        sql = 'select a,  count(1) as "count"\n   from t\n  group by a;'
+        first = parse_sql(sql)
+        hits = parsed.stats.hits
+        second = parse_sql('select a, count(1) as "count"\nfrom t\ngroup by a')
+        self.assertEqual(parsed.stats.hits, hits + 1, "expecting same normalized sql to hit the cache")
+        self.assertEqual(second, first)
+
+        second.where = {"eq": {"a": 1}}
+        self.assertTrue(parse_sql(sql).where == None, "expecting the cached query to be unchanged")
+
+    def test_quoted_whitespace_is_kept(self):
+        first = parse_sql("select a from t where b = 'x  y'")
+        second = parse_sql("select a from t where b = 'x y'")
+        self.assertTrue(first != second, "expecting whitespace in quotes to matter")
+
+    def test_quote_in_comment(self):
+        # THE ' IN THE COMMENT DOES NOT START A STRING
+        for sql in ["-- don't\nselect * from t where a = 'x  y'", "# don't\nselect * from t where a = 'x  y'"]:
+            result = parse_sql(sql)
+            self.assertEqual(result.where.eq, ["a", {"literal": "x  y"}])
+            self.assertEqual(parse_sql(sql.replace("x  y", "x y")).where.eq, ["a", {"literal": "x y"}])
+
+    def test_concurrent_parse(self):
+        sqls = [_sql(i) for i in range(NUM_PARSES)]
+        expected = [moz_sql_parser.parse(sql) for sql in sqls]
+
+        results = [None] * NUM_PARSES
+
+        def parse(t, please_stop):
+            for i in range(t, NUM_PARSES, NUM_THREADS):
+                results[i] = moz_sql_parser.parse(sqls[i])
+
+        threads = [Thread.run("parse " + text(t), parse, t) for t in range(NUM_THREADS)]
+        for t in threads:
+            t.join()
+        for r, e in zip(results, expected):
+            self.assertTrue(r == e)
+
+    def test_concurrent_parse_errors(self):
+        sqls = ["select a from t where", "select a, from t", "select a from t group", "select from"]
+        expected = [_error(sql) for sql in sqls]
+
+        def parse(t, please_stop):
+            for i in range(NUM_ERRORS):
+                sql = sqls[(t + i) % len(sqls)]
+                results.append((sql, _error(sql)))
+
+        results = []
+        threads = [Thread.run("parse " + text(t), parse, t) for t in range(NUM_THREADS)]
+        for t in threads:
+            t.join()
+        self.assertEqual(len(results), NUM_THREADS * NUM_ERRORS)
+        for sql, error in results:
+            self.assertEqual(error, expected[sqls.index(sql)], "for " + sql)
+
+
+def _error(sql):
+    try:
+        moz_sql_parser.parse(sql)
+    except Exception as e:
+        return text(e)
+    return None
+
+
+def _sql(i):
+    return [
+        "select a, b from t" + text(i) + " where v > " + text(i),
+        "select count(1) as c from t group by g" + text(i),
+        "select a from t where b = 'x" + text(i) + "' limit " + text(i + 1),
+    ][i % 3]
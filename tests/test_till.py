@@ -0,0 +1,72 @@
+# encoding: utf-8
+#
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this file,
+# You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# Contact: Kyle Lahnakoski (kyle@lahnakoski.com)
+#
+
+from __future__ import absolute_import, division, unicode_literals
+
+import gc
+from time import time
+
+from mo_testing.fuzzytestcase import FuzzyTestCase
+from mo_threads import Signal, Till
+from mo_threads.till import COMPACT_SIZE, INTERVAL, timer_stats
+
+NUM_DEAD = 2 * COMPACT_SIZE
+
+
+class TestTill(FuzzyTestCase):
+    """
+    THE daemon IS SHARED WITH ANY OTHER THREAD USING Till, SO THE COUNTERS
+    ARE CHECKED FOR AT LEAST THE TIMERS MADE HERE
+    """
+
+    def test_fire_order(self):
+        start = timer_stats()
+        fired = []
+        base = time() + 0.5
+        # (name, offset) IN THE ORDER MADE; b AND d, AND c AND e, HAVE THE SAME timeout
+        timers = [("a", 0.3), ("b", 0.1), ("c", 0.2), ("d", 0.1), ("e", 0.2), ("f", 0.0)]
+        live = []
+        for name, offset in timers:
+            t = Till(till=base + offset)
+            t.then(lambda name=name: fired.append(name))
+            live.append(t)
+
+        # NOBODY WAITS ON THESE, SO THEY ARE COLLECTED, NOT FIRED
+        for offset in [0.25, 0.05, 0.1]:
+            Till(till=base + offset).then(lambda: fired.append("dead"))
+        gc.collect()
+
+        # JOBS RUN IN THE ORDER GIVEN, SO done IS AFTER THE LAST append()
+        done = Signal()
+        live[0].then(done.go)
+        done.wait()
+
+        self.assertEqual(fired, ["f", "b", "d", "c", "e", "a"])
+        end = timer_stats()
+        self.assertGreaterEqual(end["fired"] - start["fired"], len(timers))
+        self.assertGreaterEqual(end["collected"] - start["collected"], 3)
+        self.assertGreaterEqual(end["max_lag"], 0)
+
+    def test_collect_far_timers(self):
+        start = timer_stats()
+        far = time() + 3600
+        for i in range(NUM_DEAD):
+            Till(till=far - i)
+        gc.collect()
+        self.assertGreaterEqual(timer_stats()["active"], NUM_DEAD)
+
+        # THE HEAP IS CLEANED LONG BEFORE THE TIMERS EXPIRE
+        for _ in range(50):
+            Till(seconds=INTERVAL).wait()
+            if timer_stats()["collected"] - start["collected"] >= NUM_DEAD:
+                break
+        end = timer_stats()
+        self.assertGreaterEqual(end["collected"] - start["collected"], NUM_DEAD)
+        self.assertLess(end["active"], NUM_DEAD)